@@ -27,6 +27,18 @@ class Settings:
     MAX_IMAGES_PER_REQUEST = 5
     DEFAULT_IMAGE_SIZE = "1024x1024"
     SUPPORTED_IMAGE_FORMATS = ["png", "jpg", "jpeg"]
+    USE_REFERENCE_IMAGES = os.getenv("USE_REFERENCE_IMAGES", "false").lower() == "true"
+    REF_IMGS_DIR = os.getenv(
+        "REF_IMGS_DIR",
+        os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "datasets", "ref_imgs"
+        ),
+    )
+
+    # Process-wide caps on in-flight OpenAI requests; every workflow makes five
+    # image calls, so the image cap should be a multiple of five
+    MAX_CONCURRENT_CHAT_REQUESTS = int(os.getenv("MAX_CONCURRENT_CHAT_REQUESTS", 8))
+    MAX_CONCURRENT_IMAGE_REQUESTS = int(os.getenv("MAX_CONCURRENT_IMAGE_REQUESTS", 10))
 
 
 settings = Settings()
@@ -1,19 +1,45 @@
 import uvicorn
+import logging
 import os
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from routers import image_generation, streaming
+from services.image_service import image_service
 
 # Load environment variables from .env file
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Hand log records to a background thread so handler I/O never blocks the loop
+    root_logger = logging.getLogger()
+    original_handlers = root_logger.handlers[:]
+    handlers = original_handlers or [logging.StreamHandler()]
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root_logger.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    try:
+        yield
+        # Release pooled OpenAI connections on shutdown
+        await image_service.aclose()
+    finally:
+        listener.stop()
+        root_logger.handlers = original_handlers
+
+
 app = FastAPI(
     title="LinkedIn Ads Image Generation Studio",
     description="AI-powered image generation for LinkedIn advertisements",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
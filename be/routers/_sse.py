@@ -0,0 +1,6 @@
+import orjson
+
+
+def format_sse_event(event: dict) -> str:
+    """Serialize an event as a Server-Sent Events data frame."""
+    return f"data: {orjson.dumps(event).decode()}\n\n"
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 import uuid
 from typing import AsyncGenerator, Dict, List
@@ -13,10 +12,12 @@ from models import (
     ImageModificationRequest,
     ImageModificationResponse,
 )
+from routers._sse import format_sse_event
 from services.image_service import image_service
 
 router = APIRouter(prefix="/images", tags=["Image Generation"])
 
+
 # In-memory storage for generated images (in production, use a database)
 generated_images_store: Dict[str, dict] = {}
 
@@ -65,7 +66,13 @@ async def generate_images_stream(request: ImageGenerationRequest):
             request_id = str(uuid.uuid4())
 
             # Send initial event
-            yield f"data: {json.dumps({'type': 'started', 'message': 'Starting image generation...', 'request_id': request_id})}\n\n"
+            yield format_sse_event(
+                {
+                    "type": "started",
+                    "message": "Starting image generation...",
+                    "request_id": request_id,
+                }
+            )
 
             # Create a callback that yields events
             async def progress_callback(event_data):
@@ -85,15 +92,26 @@ async def generate_images_stream(request: ImageGenerationRequest):
                 }
 
                 # Send completion event
-                yield f"data: {json.dumps({'type': 'completed', 'request_id': request_id, 'images': [img.dict() for img in images], 'message': f'Successfully generated {len(images)} images'})}\n\n"
+                yield format_sse_event(
+                    {
+                        "type": "completed",
+                        "request_id": request_id,
+                        "images": [img.dict() for img in images],
+                        "message": f"Successfully generated {len(images)} images",
+                    }
+                )
             else:
-                yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to generate any images'})}\n\n"
+                yield format_sse_event(
+                    {"type": "error", "message": "Failed to generate any images"}
+                )
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': f'Image generation failed: {str(e)}'})}\n\n"
+            yield format_sse_event(
+                {"type": "error", "message": f"Image generation failed: {str(e)}"}
+            )
 
         # Send end event
-        yield f"data: {json.dumps({'type': 'end'})}\n\n"
+        yield format_sse_event({"type": "end"})
 
     return StreamingResponse(
         event_stream(),
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 import uuid
 from typing import AsyncGenerator
@@ -9,15 +8,13 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from models import ImageGenerationRequest
-from services.image_service import ImageGenerationService
+from routers._sse import format_sse_event
+from services.image_service import image_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/stream", tags=["streaming"])
 
-# Create service instance
-image_service = ImageGenerationService()
-
 
 class StreamingRequest(BaseModel):
     """Request model for streaming image generation."""
@@ -33,7 +30,7 @@ class StreamingRequest(BaseModel):
 @router.post("/generate")
 async def stream_generate_images(request: StreamingRequest):
     """Generate images with streaming progress updates."""
-    print(f"🚀 Starting streaming generation for: {request.product_name}")
+    logger.info(f"🚀 Starting streaming generation for: {request.product_name}")
 
     try:
         # Create a custom streaming class to handle real-time events
@@ -43,7 +40,7 @@ async def stream_generate_images(request: StreamingRequest):
                 self.finished = False
 
             async def callback(self, event_data):
-                print(
+                logger.debug(
                     f"📡 Streaming event: {event_data.get('type')} - {event_data.get('message', '')}"
                 )
                 await self.queue.put(event_data)
@@ -67,7 +64,13 @@ async def stream_generate_images(request: StreamingRequest):
                 )
 
                 # Send initial step started event
-                yield f"data: {json.dumps({'type': 'step_started', 'step': 'company_analysis', 'message': '🔍 Starting company analysis...'})}\n\n"
+                yield format_sse_event(
+                    {
+                        "type": "step_started",
+                        "step": "company_analysis",
+                        "message": "🔍 Starting company analysis...",
+                    }
+                )
 
                 # Start the workflow in background
                 async def run_workflow():
@@ -95,7 +98,7 @@ async def stream_generate_images(request: StreamingRequest):
                         break
 
                     # Stream the event immediately
-                    yield f"data: {json.dumps(event_data)}\n\n"
+                    yield format_sse_event(event_data)
 
                 # Send final completion event
                 if result and len(result) > 0:
@@ -104,17 +107,34 @@ async def stream_generate_images(request: StreamingRequest):
                     for image in result:
                         image.request_id = request_id
 
-                    yield f"data: {json.dumps({'type': 'generation_complete', 'images': [{'id': img.id, 'url': img.url, 'style': img.style.value, 'prompt_used': img.prompt_used} for img in result], 'request_id': request_id, 'message': '✅ All images generated successfully!'})}\n\n"
+                    yield format_sse_event(
+                        {
+                            "type": "generation_complete",
+                            "images": [
+                                {
+                                    "id": img.id,
+                                    "url": img.url,
+                                    "style": img.style.value,
+                                    "prompt_used": img.prompt_used,
+                                }
+                                for img in result
+                            ],
+                            "request_id": request_id,
+                            "message": "✅ All images generated successfully!",
+                        }
+                    )
                 else:
                     raise Exception("No images were generated")
 
                 # Send final done event
-                yield f"data: {json.dumps({'type': 'done'})}\n\n"
+                yield format_sse_event({"type": "done"})
 
             except Exception as e:
                 logger.error(f"Error in streaming generation: {e}")
-                yield f"data: {json.dumps({'type': 'error', 'message': f'Generation failed: {str(e)}'})}\n\n"
-                yield f"data: {json.dumps({'type': 'done'})}\n\n"
+                yield format_sse_event(
+                    {"type": "error", "message": f"Generation failed: {str(e)}"}
+                )
+                yield format_sse_event({"type": "done"})
 
         return StreamingResponse(
             generate_stream(),
@@ -1,43 +1,149 @@
 import asyncio
 import base64
+import contextlib
 import logging
 import os
 import random
+import re
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, AsyncGenerator, Callable, Collection, Dict, List, Optional
 
+import httpx
+import openai
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.utils.json import parse_partial_json
 from langchain_openai import ChatOpenAI
-from langgraph.graph import END, StateGraph
-from langgraph.graph.state import CompiledStateGraph
 from openai import AsyncOpenAI
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
+from config import settings
 from models import (
+    AdCopy,
     GeneratedImage,
     ImageGenerationRequest,
     ImageModificationRequest,
     ImageStyle,
 )
+from services.llm_cache import LLMCache
 
 logger = logging.getLogger(__name__)
 
+REF_IMGS_PATH = Path(settings.REF_IMGS_DIR).resolve()
+
+# System prompts hold only static text so their tokens form a stable, cacheable
+# prefix; per-request values are sent afterwards as a JSON inputs message.
+_ANALYSIS_SYSTEM_PROMPT = """Analyze the company in the inputs to guide photorealistic LinkedIn B2B ad images. Give specific, actionable recommendations for:
+1. Brand personality and visual tone
+2. Audience persona: roles, pain points, visual preferences
+3. B2B messaging themes (ROI, efficiency, innovation, trust, expertise)
+4. Professional settings and inclusive, authentic representation
+5. Data visualization elements tied to the business value
+6. Mood: lighting, expressions, atmosphere
+7. Camera angles, composition and photographic details
+8. Thumb-stopping elements that keep B2B credibility
+9. Industry-specific visual cues"""
+
+_STYLE_DESCRIPTIONS = {
+    ImageStyle.PROFESSIONAL: """Professional business person on clean, simple background. Show: confident business professional in suit or professional attire, positioned prominently in frame, warm studio lighting, diverse representation. Background: solid white, light gray, or subtle blue gradient - NO office environments, NO complex backgrounds. Technical specs: shot on Canon 5D with 50mm lens, shallow depth of field focusing on person, high contrast between person and background for text overlay. Person should have confident, approachable expression with professional credibility.""",
+    ImageStyle.MODERN: """Modern professional with tech-forward styling on minimalist backdrop. Show: contemporary business person in modern professional attire, clean lines, tech-savvy appearance. Background: solid modern colors like navy blue, teal, or clean geometric pattern - AVOID complex office environments. Technical specs: crisp quality, modern color schemes, mobile-optimized composition. Focus on single person with contemporary, innovative look against simple background.""",
+    ImageStyle.CREATIVE: """Creative professional with artistic but business-appropriate styling. Show: expressive but professional person with creative energy, approachable demeanor, engaging eye contact. Background: simple vibrant colors or subtle artistic patterns - NOT overwhelming, NO complex environments. Use compelling lighting and rich textures on the person while keeping background minimal. Balance creativity with professional credibility through clean composition.""",
+    ImageStyle.MINIMALIST: """Ultra-clean portrait with maximum simplicity. Show: single professional person, headshot or upper body, simple clothing, clear focus on person. Background: pure white, light gray, or single solid color - absolutely minimal, NO patterns or distractions. Technical specs: sharp focus on person, clean lines, professional lighting. Emphasize clarity and simplicity with lots of negative space around the person.""",
+    ImageStyle.BOLD: """Confident professional with strong visual impact on high-contrast background. Show: dynamic business person with confident presence, strong expression, professional attire. Background: bold solid colors like deep blue, black, or strong contrast colors - NO complex elements. Technical specs: high contrast between person and background, energetic lighting on person. Focus on single confident professional against simple, bold background.""",
+}
+
+_FALLBACK_PROMPT_TEMPLATES = {
+    ImageStyle.PROFESSIONAL: """Professional business person in suit, confident expression, shot on Canon 5D with studio lighting, solid white or light gray background, upper body composition, diverse representation, high contrast for text overlay, square format, LinkedIn optimized. Context: {base_context}""",
+    ImageStyle.MODERN: """Modern business professional in contemporary attire, tech-savvy appearance, clean navy blue or teal solid background, professional photography, confident pose, diverse representation, high contrast, square format, mobile optimized. Context: {base_context}""",
+    ImageStyle.CREATIVE: """Creative professional with expressive but business-appropriate styling, approachable demeanor, simple vibrant colored background, artistic lighting, engaging eye contact, diverse representation, clean composition, high contrast for text. Context: {base_context}""",
+    ImageStyle.MINIMALIST: """Single business professional headshot, simple clothing, pure white background, minimal composition, sharp focus on person, professional lighting, lots of negative space, diverse representation, ultra-clean design. Context: {base_context}""",
+    ImageStyle.BOLD: """Confident business person with strong presence, professional attire, bold solid color background (deep blue or black), high contrast lighting, dynamic expression, diverse representation, square format, impactful composition. Context: {base_context}""",
+}
+
+_DEFAULT_FALLBACK_PROMPT = "Professional photorealistic LinkedIn advertisement image for {base_context}, shot on Canon 5D with 50mm lens, diverse representation, modern office setting, high contrast for text overlay, B2B optimized"
+
+_STYLE_SYSTEM_PROMPT = """Write one image-generation prompt per style for a square (1:1, 1200x1200) LinkedIn B2B ad, using the product, audience, business value, company analysis and CTA text in the inputs.
+
+Styles:
+{style_guides}
+
+Every prompt (max 300 words) must:
+1. Start with "Create LinkedIn Ad image of..." and follow ACTION + SUBJECT + CONTEXT + VISUAL DETAILS + STYLE CUES + CTA.
+2. Show 1-2 diverse business professionals who embody the target audience: confident, authentic, industry-appropriate attire, headshot or upper body.
+3. Use a simple background only: solid color, subtle gradient or minimal geometric shapes; no offices or busy scenes. Pick a color that fits the style.
+4. Specify "shot on Canon 5D with 50mm lens, studio lighting, shallow depth of field", sharp focus on the people.
+5. Reserve 20-30% of the frame (left/right or bottom third) for the CTA text, rendered with at least 4.5:1 contrast against the background.
+6. Include the exact CTA text from the inputs.
+7. Reflect the company analysis and visualize the business value with an appropriate metaphor.
+8. Stay legible on mobile and attention-grabbing without losing B2B credibility.
+Keep the styles clearly distinct from each other.
+
+Output Format: return ONLY a JSON object whose keys are exactly {style_keys}, each mapped to the full prompt for that style.""".format(
+    style_guides="\n".join(
+        f"- {style.value}: {description}"
+        for style, description in _STYLE_DESCRIPTIONS.items()
+    ),
+    style_keys=", ".join(f'"{style.value}"' for style in _STYLE_DESCRIPTIONS),
+)
+
+_MODIFY_SYSTEM_PROMPT = """Create a professional LinkedIn advertisement image by applying the user's modification request to the provided image.
+
+Ensure the image maintains LinkedIn B2B ad best practices:
+- Professional business people (1-2 max) as main subjects
+- Simple, clean backgrounds (solid colors, subtle gradients) that contrast well with text
+- High contrast areas reserved for CTA text overlay
+- Square format (1024x1024) optimized for LinkedIn mobile feed
+- Professional photography quality (Canon 5D, 50mm lens, studio lighting)
+- Diverse, authentic representation
+- Clear visual hierarchy for mobile viewing
+- Space allocation for text overlay (20-30% of image)
+- B2B credibility and thought leadership positioning
+
+IMPORTANT: Generate image in exactly 1024x1024 pixels resolution. Ensure proper aspect ratio and high quality.
+
+Apply the requested modifications while maintaining these professional standards."""
+
+_AD_COPY_SYSTEM_PROMPT = """Act as a LinkedIn advertising expert. Write high-converting B2B ad copy for the campaign in the inputs (company analysis, product, business value, target audience).
+
+1. Follow AIDA: a hook (pain-point question, stat or curiosity), a clear value proposition, social proof or authority, then a specific CTA.
+2. Speak to the audience's roles, daily pain points and desired outcomes.
+3. Lead with outcomes rather than features, and quantify benefits where possible.
+4. Keep a professional, trustworthy tone; avoid hype, and keep it mobile-friendly.
+5. Use an action-oriented CTA such as "Book a Call" or "Get Started".
+
+Return ONLY a JSON object with exactly these fields:
+{
+    "headline": "hook headline, max 150 chars",
+    "description": "AIDA description with value proposition and social proof, max 600 chars",
+    "cta": "CTA, max 20 chars"
+}
+If the inputs include "description_override", use it verbatim as the description.
+If the inputs include "cta_override", use it verbatim as the cta."""
+
 
 class ReferenceImage(BaseModel):
-    """Model for reference image data."""
+    """Uploaded reference image, sent to image calls by its OpenAI file id."""
     id: str
-    base64_image: str
+    path: Path
 
 
 class WorkflowState(BaseModel):
-    """State for the LangGraph workflow."""
+    """State passed between the workflow stages."""
 
     request: ImageGenerationRequest
     company_analysis: Optional[str] = None
@@ -48,8 +154,267 @@ class WorkflowState(BaseModel):
     error: Optional[str] = None
 
 
+# Upper bounds so a stalled OpenAI call cannot wedge a streaming request
+_WORKFLOW_STEP_TIMEOUT = 90
+_IMAGE_GENERATION_TIMEOUT = 300
+
+# Style prompts are sampled at temperature 0.7 for variety, so they are only
+# reused for quick resubmissions (double clicks, retries after image failures)
+_STYLE_PROMPT_CACHE_TTL = 120
+
+# Transient OpenAI failures worth retrying; APITimeoutError is an APIConnectionError
+_RETRYABLE_OPENAI_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+_retry_backoff = wait_random_exponential(min=1, max=30)
+
+
+def _input_message(variables: Dict[str, Any]) -> HumanMessage:
+    """Render per-request values as a JSON message placed after the system prompt."""
+    return HumanMessage(
+        content="Inputs:\n"
+        + orjson.dumps(variables, option=orjson.OPT_INDENT_2).decode()
+    )
+
+
+def _list_reference_images(directory: Path) -> List[Path]:
+    """Return the image files in the reference directory, or [] if it is missing."""
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if entry.is_file()
+                and entry.name.lower().endswith((".png", ".jpg", ".jpeg"))
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Jittered exponential backoff that honours the server's Retry-After header."""
+    delay = _retry_backoff(retry_state)
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            delay = max(delay, float(response.headers.get("retry-after", 0)))
+        except (TypeError, ValueError):
+            pass
+    return delay
+
+
+def _extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the first JSON object in an LLM response, ignoring fences and prose."""
+    start = text.find("{")
+    if start == -1:
+        return None
+    # Match braces outside of string literals to find where the object ends
+    depth = 0
+    in_string = False
+    escaped = False
+    for end in range(start, len(text)):
+        char = text[end]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                try:
+                    parsed = orjson.loads(text[start : end + 1])
+                except orjson.JSONDecodeError:
+                    return None
+                return parsed if isinstance(parsed, dict) else None
+    return None
+
+
+def _parse_ad_copy(content: str) -> Dict[str, str]:
+    """Extract the ad copy object from an LLM response and validate it."""
+    ad_copy = _extract_json(content)
+    if ad_copy is None:
+        raise ValueError("Ad copy response did not contain a JSON object")
+    # Schema check so a malformed response cannot reach the client
+    try:
+        return AdCopy.model_validate(ad_copy).model_dump()
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise ValueError(f"Ad copy failed validation ({problems})") from e
+
+
+def _image_input(file_id: str) -> Dict[str, str]:
+    """Responses API input item for an uploaded image.
+
+    Images are sent once, by file id; adding an inline base64 copy as well
+    would double the image input tokens of every call.
+    """
+    return {"type": "input_image", "file_id": file_id}
+
+
+def _save_image(image_path: Path, image_base64: str) -> None:
+    """Decode a generated image and write it to disk (run in a worker thread)."""
+    image_path.write_bytes(base64.b64decode(image_base64))
+
+
+# Process-wide caps on in-flight OpenAI requests, so fan-out from concurrent
+# workflows queues locally instead of tripping rate limits
+_CHAT_SEMAPHORE = asyncio.Semaphore(settings.MAX_CONCURRENT_CHAT_REQUESTS)
+_IMAGE_SEMAPHORE = asyncio.Semaphore(settings.MAX_CONCURRENT_IMAGE_REQUESTS)
+
+
+def _retrying() -> AsyncRetrying:
+    """Retry policy for transient OpenAI failures."""
+    return AsyncRetrying(
+        wait=_retry_wait,
+        stop=stop_after_attempt(5),
+        retry=retry_if_exception_type(_RETRYABLE_OPENAI_ERRORS),
+        reraise=True,
+    )
+
+
+async def _call_with_retry(semaphore: asyncio.Semaphore, func, *args, **kwargs):
+    """Await an OpenAI call, retrying transient failures with backoff.
+
+    Each attempt holds a slot of ``semaphore``; the slot is released while
+    backing off so waiting retries do not block other requests.
+    """
+    async for attempt in _retrying():
+        with attempt:
+            async with semaphore:
+                return await func(*args, **kwargs)
+
+
+async def _astream_with_retry(llm, messages: List) -> AsyncGenerator[str, None]:
+    """Stream an LLM response's text, retrying failures before the first chunk.
+
+    Like ``_call_with_retry``, each attempt takes its own chat slot so backoff
+    sleeps do not hold one; a successful attempt keeps the slot until the
+    stream ends, since the request stays open until then.
+    """
+    async for attempt in _retrying():
+        with attempt:
+            await _CHAT_SEMAPHORE.acquire()
+            stream = llm.astream(messages)
+            try:
+                first = await anext(stream, None)
+            except BaseException:
+                _CHAT_SEMAPHORE.release()
+                # Close the failed attempt's stream before the next one opens
+                await stream.aclose()
+                raise
+    try:
+        if first is None:
+            return
+        yield first.content
+        async for chunk in stream:
+            yield chunk.content
+    finally:
+        # Release the HTTP stream when the caller stops reading early
+        await stream.aclose()
+        _CHAT_SEMAPHORE.release()
+
+
+async def _astream_json_object(llm, messages: List) -> str:
+    """Stream a response, returning as soon as its first JSON object is complete.
+
+    Raises ValueError if the stream ends without one, e.g. when the response
+    hits its token cap, so the caller never caches a truncated object.
+    """
+    content = ""
+    async with contextlib.aclosing(_astream_with_retry(llm, messages)) as stream:
+        async for text in stream:
+            content += text
+            if "}" in text and _extract_json(content) is not None:
+                return content
+    raise ValueError("Response ended without a complete JSON object")
+
+
+# Called with (index, style, style_value, prompt) as each style's prompt completes
+PromptCallback = Callable[[int, ImageStyle, str, str], None]
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _rate_limit_pause(headers: httpx.Headers) -> float:
+    """Seconds until the request window resets if at most one request is left."""
+    try:
+        remaining = int(headers.get("x-ratelimit-remaining-requests", ""))
+    except ValueError:
+        return 0.0
+    if remaining > 1:
+        return 0.0
+    # OpenAI reports resets as durations like "20ms", "1s" or "6m0s"
+    reset = headers.get("x-ratelimit-reset-requests", "")
+    return sum(
+        float(value) * _DURATION_UNITS[unit]
+        for value, unit in _DURATION_PART.findall(reset)
+    )
+
+
+class StreamEventEmitter:
+    """Forward workflow events to a stream callback without blocking the workflow.
+
+    Events are buffered in a bounded queue and delivered by a background task,
+    so a slow SSE consumer never stalls the OpenAI calls. When the buffer is
+    full, ``progress`` events are dropped; all other events wait for space.
+    """
+
+    def __init__(self, callback=None, maxsize: int = 64):
+        self._callback = callback
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainer: Optional[asyncio.Task] = None
+        if callback:
+            self._queue = asyncio.Queue(maxsize=maxsize)
+            self._drainer = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        assert self._queue is not None
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+            try:
+                await self._callback(event)
+            except Exception as e:
+                logger.error(f"Error delivering stream event: {e}")
+
+    async def emit(self, event: Dict) -> None:
+        """Queue an event for delivery."""
+        if self._queue is None:
+            return
+        if event.get("type") == "progress":
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.debug(f"Dropping progress event: {event.get('message')}")
+            return
+        await self._queue.put(event)
+
+    async def aclose(self) -> None:
+        """Deliver all queued events and stop the background task."""
+        if self._queue is None or self._drainer is None:
+            return
+        await self._queue.put(None)
+        await self._drainer
+
+
 class ImageGenerationService:
-    """Service for generating LinkedIn ad images using LangGraph workflow."""
+    """Service for generating LinkedIn ad images through a multi-step LLM workflow."""
 
     def __init__(self):
         api_key = os.getenv("OPENAI_API_KEY")
@@ -57,13 +422,37 @@ class ImageGenerationService:
             logger.warning(
                 "OPENAI_API_KEY not found. Service will use placeholder responses."
             )
+            self._http_client = None
             self.openai_client = None
             self.llm = None
+            self.analysis_llm = None
+            self.prompt_llm = None
+            self.copy_llm = None
         else:
-            self.openai_client = AsyncOpenAI()
+            # One pooled HTTP/2 client shared by the image and chat clients; every
+            # connection may stay alive so fan-out bursts never re-handshake TLS
+            self._http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            )
+            # SDK retries are disabled; _call_with_retry is the single retry layer
+            self.openai_client = AsyncOpenAI(
+                http_client=self._http_client, max_retries=0
+            )
             self.llm = ChatOpenAI(
                 model="gpt-4o-mini",
                 temperature=0.7,
+                max_retries=0,
+                http_async_client=self._http_client,
+            )
+            # Analysis and ad copy run at temperature 0 so a cached answer is the
+            # answer; output caps bound decode time to what each step needs
+            self.analysis_llm = self.llm.bind(temperature=0, max_tokens=800)
+            self.prompt_llm = self.llm.bind(
+                max_tokens=3000, response_format={"type": "json_object"}
+            )
+            self.copy_llm = self.llm.bind(
+                temperature=0, max_tokens=400, response_format={"type": "json_object"}
             )
         self.styles = [
             ImageStyle.PROFESSIONAL,
@@ -72,35 +461,107 @@ class ImageGenerationService:
             ImageStyle.MINIMALIST,
             ImageStyle.BOLD,
         ]
-        self.workflow = self._create_workflow()
-        self.reference_images_path = (
-            Path(__file__).parent.parent / "datasets" / "ref_imgs"
-        )
+        # (style, value) resolved once for the per-style loops
+        self._styles_cached = tuple((style, style.value) for style in self.styles)
+        self.reference_images_path = REF_IMGS_PATH
+        # The reference directory is static, so it is listed once per service
+        all_image_files = _list_reference_images(self.reference_images_path)
+        self._main_ref_files = [
+            f for f in all_image_files if f.name.startswith("main_ref")
+        ]
+        self._other_ref_files = [
+            f for f in all_image_files if not f.name.startswith("main_ref")
+        ]
+        # Uploaded OpenAI file ids per reference image, reused across requests
+        self._reference_file_ids: Dict[Path, str] = {}
 
-        # In-memory storage for generated images
-        self.image_storage: Dict[str, List[GeneratedImage]] = {}
+        # Responses for the cacheable workflow steps (analysis, ad copy)
+        self.llm_cache = LLMCache()
+        # Short-lived so regenerating after a while still gives fresh variations
+        self.style_prompt_cache = LLMCache(ttl_seconds=_STYLE_PROMPT_CACHE_TTL)
 
-    def _create_workflow(self) -> CompiledStateGraph:
-        """Create the LangGraph workflow for image generation."""
+        # Monotonic time before which image calls wait for the rate limit to reset
+        self._rate_limit_resume_at = 0.0
 
-        workflow = StateGraph(WorkflowState)
+        # In-memory storage for generated images
+        self.image_storage: Dict[str, List[GeneratedImage]] = {}
 
-        # Add nodes
-        workflow.add_node("analyze_company", self._analyze_company)
-        workflow.add_node("load_references", self._load_reference_images)
-        workflow.add_node("enhance_prompts", self._enhance_prompts)
-        workflow.add_node("generate_copy", self._generate_ad_copy)
-        workflow.add_node("generate_images", self._generate_images_node)
+    async def _cached_ainvoke(
+        self,
+        llm,
+        template_id: str,
+        variables: Dict[str, str],
+        messages: List,
+        json_object: bool = False,
+        parse: Optional[Callable[[str], Any]] = None,
+        verbatim: Collection[str] = (),
+    ) -> Any:
+        """Invoke the LLM, reusing the response for identical template inputs.
+
+        With ``json_object`` the response is streamed and returned as soon as
+        its JSON object closes, without waiting for the rest of the stream.
+        ``parse`` turns the response into the return value; a response it
+        rejects raises and is not cached, so it cannot be replayed for the
+        cache's lifetime. ``verbatim`` is passed on to ``LLMCache.make_key``.
+        """
+        key = LLMCache.make_key(template_id, variables, verbatim)
+        cached = self.llm_cache.get(key)
+        if cached is not None:
+            logger.info(f"LLM cache hit for {template_id}")
+            return parse(cached) if parse else cached
+
+        if json_object:
+            content = await _astream_json_object(llm, messages)
+        else:
+            response = await _call_with_retry(_CHAT_SEMAPHORE, llm.ainvoke, messages)
+            content = response.content
+        result = parse(content) if parse else content
+        self.llm_cache.set(key, content)
+        return result
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Sleep until the last observed rate-limit window has reset."""
+        delay = self._rate_limit_resume_at - time.monotonic()
+        if delay > 0:
+            logger.info(f"Rate limit nearly exhausted, pausing {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def _record_rate_limit(self, headers: httpx.Headers) -> None:
+        """Schedule a pause when the response reports no requests left in the window."""
+        pause = _rate_limit_pause(headers)
+        if pause:
+            self._rate_limit_resume_at = max(
+                self._rate_limit_resume_at, time.monotonic() + pause
+            )
 
-        # Define the flow
-        workflow.set_entry_point("analyze_company")
-        workflow.add_edge("analyze_company", "load_references")
-        workflow.add_edge("load_references", "enhance_prompts")
-        workflow.add_edge("enhance_prompts", "generate_copy")
-        workflow.add_edge("generate_copy", "generate_images")
-        workflow.add_edge("generate_images", END)
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool."""
+        if self._http_client:
+            await self._http_client.aclose()
+
+    async def _run_workflow(self, state: WorkflowState) -> WorkflowState:
+        """Run the workflow stages, gathering the ones that are independent."""
+        state = await self._prepare_context(state)
+        if state.error:
+            return state
+        return await self._generate_ads(state)
+
+    async def _prepare_context(self, state: WorkflowState) -> WorkflowState:
+        """Analyze the company and load reference images concurrently."""
+        # Each stage writes its own fields of the shared state
+        await asyncio.gather(
+            self._analyze_company(state), self._load_reference_images(state)
+        )
+        return state
 
-        return workflow.compile()
+    async def _generate_content(
+        self, state: WorkflowState, on_prompt: Optional[PromptCallback] = None
+    ) -> WorkflowState:
+        """Generate the image prompts and the ad copy concurrently."""
+        await asyncio.gather(
+            self._enhance_prompts(state, on_prompt), self._generate_ad_copy(state)
+        )
+        return state
 
     async def _analyze_company(self, state: WorkflowState) -> WorkflowState:
         """Analyze the company to understand their brand and context."""
@@ -109,34 +570,23 @@ class ImageGenerationService:
                 state.company_analysis = f"Professional business analysis for {state.request.product_name} targeting {state.request.audience}"
                 return state
 
-            analysis_prompt = f"""
-            Analyze the following company information and provide comprehensive insights for creating high-performing LinkedIn B2B ad images:
-
-            Company URL: {state.request.company_url}
-            Product: {state.request.product_name}
-            Business Value: {state.request.business_value}
-            Target Audience: {state.request.audience}
-            Body Text: {state.request.body_text}
-            Footer Text: {state.request.footer_text}
-
-            Provide:
-            
-            1. **Brand Personality & Visual Tone**: Analyze brand voice and recommend specific visual aesthetics (corporate, innovative, approachable, authoritative)
-            2. **Audience Persona Insights**: Detail target customer demographics, pain points, and visual preferences for personalized imagery
-            3. **B2B Messaging Themes**: Identify key value propositions that resonate (ROI, efficiency, innovation, trust, expertise)
-            4. **Professional Context Settings**: Recommend specific environments (modern office, conference room, tech lab, remote workspace)
-            5. **Inclusive Representation**: Suggest diverse, authentic professional scenarios 
-            6. **Data Visualization Elements**: Recommend incorporating charts, dashboards, metrics, or statistics relevant to the business value
-            7. **Emotional Tone & Mood**: Specify lighting, expressions, and atmosphere (confident, collaborative, innovative, trustworthy)
-            8. **Technical Specifications**: Recommend camera angles, composition, and photographic details for photorealistic results
-            9. **Thumb-Stopping Elements**: Identify attention-grabbing visual elements that maintain B2B credibility
-            10. **Industry-Specific Context**: Provide sector-relevant visual cues and professional scenarios
-
-            Format your analysis with specific, actionable recommendations for detailed AI image generation prompts.
-            """
-
-            response = await self.llm.ainvoke([HumanMessage(content=analysis_prompt)])
-            state.company_analysis = response.content
+            analysis_vars = {
+                "company_url": str(state.request.company_url),
+                "product_name": state.request.product_name,
+                "business_value": state.request.business_value,
+                "audience": state.request.audience,
+                "body_text": state.request.body_text,
+                "footer_text": state.request.footer_text,
+            }
+            state.company_analysis = await self._cached_ainvoke(
+                self.analysis_llm,
+                "company_analysis_v4",
+                analysis_vars,
+                [
+                    SystemMessage(content=_ANALYSIS_SYSTEM_PROMPT),
+                    _input_message(analysis_vars),
+                ],
+            )
 
         except Exception as e:
             logger.error(f"Error in company analysis: {e}")
@@ -144,204 +594,164 @@ class ImageGenerationService:
 
         return state
 
-    async def _enhance_prompts(self, state: WorkflowState) -> WorkflowState:
-        """Generate enhanced prompts for each image style."""
+    async def _enhance_prompts(
+        self, state: WorkflowState, on_prompt: Optional[PromptCallback] = None
+    ) -> WorkflowState:
+        """Generate enhanced prompts for every image style in a single LLM call.
+
+        The response is streamed, and ``on_prompt`` is called as soon as each
+        style's prompt is complete so its image can start before the rest arrive.
+        """
+        # Prompts already handed to on_prompt, by style index
+        dispatched: Dict[int, str] = {}
+
+        def dispatch(index: int, style: ImageStyle, style_value: str, prompt: str):
+            if on_prompt and index not in dispatched:
+                dispatched[index] = prompt
+                on_prompt(index, style, style_value, prompt)
+
         try:
-            prompts = []
+            if not self.llm:
+                # Fallback prompt generation
+                state.enhanced_prompts = [
+                    self._create_fallback_prompt_for_style(state.request, style)
+                    for style, _ in self._styles_cached
+                ]
+                for index, ((style, style_value), prompt) in enumerate(
+                    zip(self._styles_cached, state.enhanced_prompts)
+                ):
+                    dispatch(index, style, style_value, prompt)
+                return state
 
-            for style in self.styles:
-                if not self.llm:
-                    # Fallback prompt generation
-                    prompt = self._create_fallback_prompt_for_style(
-                        state.request, style
+            style_vars = {
+                "product_name": state.request.product_name,
+                "audience": state.request.audience,
+                "business_value": state.request.business_value,
+                "company_analysis": state.company_analysis
+                or "Professional B2B business",
+                "cta_text": state.request.footer_text or "Learn More",
+            }
+
+            # Identical inputs reuse the earlier prompts and start every image at once
+            cache_key = LLMCache.make_key("style_prompts_v1", style_vars)
+            content = self.style_prompt_cache.get(cache_key)
+            if content is None:
+                # A stalled stream falls through to the fallback handling below,
+                # which keeps any images already started
+                try:
+                    async with asyncio.timeout(_WORKFLOW_STEP_TIMEOUT):
+                        content = await self._stream_style_prompts(
+                            style_vars, dispatch
+                        )
+                except TimeoutError:
+                    raise TimeoutError(
+                        f"Style prompts timed out after {_WORKFLOW_STEP_TIMEOUT}s"
                     )
-                    prompts.append(prompt)
-                    continue
+            else:
+                logger.info("LLM cache hit for style_prompts_v1")
 
-                style_prompt = f"""
-        Create a highly-optimized DALL-E 3 | IMAGE-GPT-1 prompt for a LinkedIn ad image with people (1 or 2 people max) on a simple background and a CTA text with high-contrass background.
-        
-        Use the proven prompt structure: ACTION + SUBJECT + CONTEXT + VISUAL DETAILS + STYLE CUES + CTA OPTIMIZATION
-
-        **Context:**
-        - Product/Service: {state.request.product_name}
-        - Target Audience: {state.request.audience}
-        - Business Value: {state.request.business_value}
-        - Style: {style.value}
-        - Company Analysis: {state.company_analysis or 'Professional B2B business'}
-
-    **Style Guide:** {self._get_style_description(style)}
-    
-    **Reference Analysis Instructions:** Incorporate the following visual patterns into your DALL-E | IMAGE-GPT-1 prompt:
-        - Professional people in business contexts with clean, high-contrast backgrounds
-        - Strategic text placement areas with optimal contrast ratios (typically left/right thirds or bottom third)
-        - LinkedIn-optimized composition and visual hierarchy with clear focal points
-        - B2B credibility signals: confident posture, professional attire, authentic expressions
-        - Thought leadership positioning with industry-appropriate visual metaphors
-        - Color schemes that work well for text overlay: solid backgrounds, gradients, or high-contrast areas
-        - Composition patterns: headshots with negative space, full-body with clear backgrounds, or group shots with strategic positioning
-        - Technical quality: professional lighting, sharp focus on subjects, appropriate depth of field
-
-        **DALL-E | IMAGE-GPT-1 Prompt Requirements:**
-
-        1. **Main Subject:** Professional business people (not more than 1 or 2 people) representing {state.request.audience}
-           - Confident, approachable expression
-           - Professional business attire appropriate for the industry
-           - Diverse representation (vary ethnicity, age, gender)
-           - Upper body or headshot composition
-           - People should embody the target audience for {state.request.product_name}
-
-        2. **Background:** Simple and clean - NO complex environments
-           - Solid colors, subtle gradients, or minimal geometric elements ONLY
-           - High contrast with the person for text overlay
-           - NO offices, NO detailed environments, NO busy patterns
-           - Choose background color that complements the {style.value} style !IMPORTANT!
-
-        3. **Technical Specs:**
-           - Square format (1:1 aspect ratio) for LinkedIn feed
-           - Professional photography quality (shot on Canon 5D, studio lighting)
-           - Sharp focus on person, slightly blurred background if needed
-           - Leave 30% of image space clear for text overlay
-           - High contrast between person and background
-
-        4. **LinkedIn Optimization:**
-           - Design for mobile viewing (clear at small sizes)
-           - Professional B2B credibility
-           - Thumb-stopping appeal without being flashy
-           - Appropriate for {state.request.audience} in {state.request.product_name} context
-
-        The prompt should be concise (max 300 words) with the goal to create a professional LinkedIn ad image with:
-        - A business person representing {state.request.audience}
-        - Simple, clean background (no complex environments)
-        - Style {style.value} specs must be highly differenciated and present in the prompt.
-        - High contrast for text overlay
-        - Professional B2B appeal
-        
-        **Critical Technical Requirements**:
-        - People portraited with photorealistic quality with simple background and CTA texts that should contrass that background.
-        - LinkedIn-optimized composition (1:1 aspect ratio preferred)
-        - HIGH CONTRAST backgrounds (light backgrounds for dark text, dark backgrounds for light text)
-        - Professional lighting for people on the image (studio quality, natural daylight, warm professional tones)
-        - Brand-aligned color palette that supports text readability
-        - Mobile-first design with clear focal points
-        - Space allocation for CTA text overlay in high-contrast areas
-        - Visual hierarchy that guides eye to CTA placement areas
-
-        **CTA Integration Requirements**:
-        - Reserve 20-30% of image space for text overlay placement
-        - Ensure background contrast ratio of at least 4.5:1 for accessibility
-        - Must have a CTA text: "{state.request.footer_text or 'Learn More'}" when designing contrast areas
-        - Include visual elements that naturally frame or highlight CTA placement
-        
-        **Required Elements (Must Include ALL):**
-        1. **Clear Action Verb**: Start with "Create LinkedIn Ad image of..." or "Generate a professional LinkedIn Ad scene showing..."
-        2. **Specific Subject**: Name exact people/objects related to {state.request.product_name} and {state.request.audience}
-        3. **Rich Context**: Detailed environment that reflects the company analysis and business value
-        4. **Technical Photography**: Include "shot on Canon 5D with 50mm lens, studio lighting, shallow depth of field for pictures portraited in the image"
-        5. **Audience Empathy**: Diverse, authentic professionals representing {state.request.audience} 
-        6. **B2B Credibility**: Thought leadership positioning, expertise signals related to {state.request.business_value}
-        7. **Emotional Tone**: Specify mood that aligns with the target audience and business context and address the audience pain points.
-        8. **CTA Optimization**: High contrast areas specifically designed for text overlay of "{state.request.footer_text or 'Learn More'}"
-        9. **Color Contrast**: Specify background colors that provide high contrast for white/dark text overlay.
-        10. **Mobile Optimization**: Clear visual hierarchy optimized for 1200x1200px LinkedIn format
-        11. **Thumb-Stopping Appeal**: Attention-grabbing elements balanced with B2B professionalism
-        12. **Brand Context**: Visual elements that reflect the company's industry and professional context
-        13. **Value Visualization**: Visual metaphors or direct representations of {state.request.business_value}
-        14. **CTA Text** : Should specify that must include CTA text: "{state.request.footer_text}" with high contrast color with background.
-        
-        **Final Instruction**: Analyze the provided reference images and generate a DALL-E 3 | IMAGE-GPT-1prompt that combines all above requirements 
-        with visual insights from the reference LinkedIn ads. Focus on composition patterns, color schemes, subject positioning, 
-        and background styles that you observe in the references to create a high-converting, professional image optimized for 
-        {state.request.audience} in the {state.request.product_name} context.
-        """
+            generated = _extract_json(content)
+            if generated is None:
+                raise ValueError("Style prompt response did not contain a JSON object")
 
-                # Create message with reference images for visual analysis
-                messages = []
-                
-                # Add the text prompt
-                messages.append(HumanMessage(content=style_prompt))
-                
- 
-                
-                response = await self.llm.ainvoke(messages)
-                prompts.append(response.content.strip())
+            prompts = []
+            for index, (style, style_value) in enumerate(self._styles_cached):
+                value = generated.get(style_value)
+                if isinstance(value, str) and value.strip():
+                    prompt = value.strip()
+                else:
+                    logger.warning(f"No prompt returned for style {style_value}")
+                    prompt = self._create_fallback_prompt_for_style(
+                        state.request, style
+                    ).strip()
+                prompts.append(prompt)
+                dispatch(index, style, style_value, prompt)
 
             state.enhanced_prompts = prompts
+            self.style_prompt_cache.set(cache_key, content)
 
         except Exception as e:
             logger.error(f"Error enhancing prompts: {e}")
-            state.error = f"Prompt enhancement failed: {str(e)}"
+            if not dispatched:
+                state.error = f"Prompt enhancement failed: {str(e)}"
+                return state
+            # Some images already started; give only the remaining styles fallback
+            # prompts instead of discarding those images and regenerating all five
+            for index, (style, style_value) in enumerate(self._styles_cached):
+                if index not in dispatched:
+                    dispatch(
+                        index,
+                        style,
+                        style_value,
+                        self._create_fallback_prompt_for_style(state.request, style),
+                    )
+            state.enhanced_prompts = [
+                dispatched[index] for index in range(len(self._styles_cached))
+            ]
 
         return state
 
+    async def _stream_style_prompts(
+        self, style_vars: Dict[str, str], dispatch: PromptCallback
+    ) -> str:
+        """Stream the batched style prompts, dispatching each as it completes."""
+        content = ""
+        async for text in _astream_with_retry(
+            self.prompt_llm,
+            [
+                SystemMessage(content=_STYLE_SYSTEM_PROMPT),
+                _input_message(style_vars),
+            ],
+        ):
+            content += text
+            # A prompt can only complete once a closing quote arrives
+            if '"' not in text:
+                continue
+            try:
+                partial = parse_partial_json(content)
+            except ValueError:
+                continue
+            if not isinstance(partial, dict):
+                continue
+            # Keys stream in order, so every key but the last one is complete
+            completed = list(partial)[:-1]
+            for index, (style, style_value) in enumerate(self._styles_cached):
+                prompt = partial.get(style_value)
+                if (
+                    style_value in completed
+                    and isinstance(prompt, str)
+                    and prompt.strip()
+                ):
+                    dispatch(index, style, style_value, prompt.strip())
+        return content
+
     async def _load_reference_images(self, state: WorkflowState) -> WorkflowState:
-        """Load and encode reference images: 1 main_ref + 1 random non-main images."""
+        """Select and upload reference images: 1 main_ref + up to 2 random non-main images."""
+        # Reference images are opt-in: they add uploads and input tokens per image
+        if not settings.USE_REFERENCE_IMAGES or not (
+            self._main_ref_files or self._other_ref_files
+        ):
+            state.reference_images = []
+            return state
 
         try:
-            reference_images = []
-            # Use correct path relative to the backend directory
-            ref_imgs_path = Path(__file__).parent.parent / "datasets" / "ref_imgs"
-
-            if ref_imgs_path.exists():
-                # Get all image files
-                all_image_files = (
-                    list(ref_imgs_path.glob("*.png"))
-                    + list(ref_imgs_path.glob("*.jpg"))
-                    + list(ref_imgs_path.glob("*.jpeg"))
+            selected_files = []
+            # Load 1 main_ref file (randomly selected if multiple exist)
+            if self._main_ref_files:
+                selected_files.append(random.choice(self._main_ref_files))
+            # Load up to 2 random other images (non-main_ref)
+            if self._other_ref_files:
+                selected_files.extend(
+                    random.sample(
+                        self._other_ref_files, min(2, len(self._other_ref_files))
+                    )
                 )
 
-                if all_image_files:
-                    # Separate main_ref files from other files
-                    main_ref_files = [
-                        f for f in all_image_files if f.name.startswith("main_ref")
-                    ]
-                    other_files = [
-                        f for f in all_image_files if not f.name.startswith("main_ref")
-                    ]
-
-                    # Load 1 main_ref file (randomly selected if multiple exist)
-                    if main_ref_files:
-                        main_ref_file = random.choice(main_ref_files)
-                        try:
-                            with open(main_ref_file, "rb") as img_file:
-                                img_data = base64.b64encode(img_file.read()).decode("utf-8")
-                                result = await self.openai_client.files.create(
-                                    file=img_file,
-                                    purpose="vision",
-                                )
-                                reference_images.append(ReferenceImage(id=result.id, base64_image=img_data))
-                                logger.info(
-                                    f"Loaded main reference: {main_ref_file.name}"
-                                )
-                        except Exception as e:
-                            logger.warning(
-                                f"Could not load main reference {main_ref_file}: {e}"
-                            )
-
-                    # Load up to 2 random other images (non-main_ref)
-                    if other_files:
-                        selected_other_files = random.sample(
-                            other_files, min(2, len(other_files))
-                        )
-
-                        for img_path in selected_other_files:
-                            try:
-                                with open(img_path, "rb") as img_file:
-                                    img_data = base64.b64encode(img_file.read()).decode("utf-8")
-                                    result = await self.openai_client.files.create(
-                                        file=img_file,
-                                        purpose="vision",
-                                    )
-                                    reference_images.append(ReferenceImage(id=result.id, base64_image=img_data))
-                            except Exception as e:
-                                logger.warning(
-                                    f"Could not load reference image {img_path}: {e}"
-                                )
-                                continue
-
-                        logger.info(
-                            f"Loaded {len(selected_other_files)} additional reference images"
-                        )
+            # Disk reads and uploads for the selected files all run at once
+            results = await asyncio.gather(
+                *(self._load_reference_image(path) for path in selected_files)
+            )
+            reference_images = [ref_img for ref_img in results if ref_img]
 
             state.reference_images = reference_images
             logger.info(
@@ -355,6 +765,23 @@ class ImageGenerationService:
 
         return state
 
+    async def _load_reference_image(self, path: Path) -> Optional[ReferenceImage]:
+        """Upload one reference image (once per process) without blocking the loop."""
+        try:
+            file_id = self._reference_file_ids.get(path)
+            if file_id is None:
+                img_bytes = await asyncio.to_thread(path.read_bytes)
+                result = await self.openai_client.files.create(
+                    file=(path.name, img_bytes),
+                    purpose="vision",
+                )
+                file_id = self._reference_file_ids[path] = result.id
+            logger.info(f"Loaded reference image: {path.name}")
+            return ReferenceImage(id=file_id, path=path)
+        except Exception as e:
+            logger.warning(f"Could not load reference image {path}: {e}")
+            return None
+
     async def _generate_ad_copy(self, state: WorkflowState) -> WorkflowState:
         """Generate high-converting LinkedIn ad copy"""
         try:
@@ -367,98 +794,37 @@ class ImageGenerationService:
                 }
                 return state
 
-            copy_prompt = f"""
-            Act as a LinkedIn advertising expert. Create high-converting B2B ad copy:
-            
-            **Campaign Context:**
-            Company Analysis: {state.company_analysis or 'Professional B2B business'}
-            Product/Service: {state.request.product_name}
-            Core Values {state.request.business_value}
-            Target Audience: {state.request.audience}
-            
-            **High-Performance Framework:**
-            
-            **1. AIDA Structure Implementation:**
-            - **Attention**: Hook that grabs attention (problem, stat, or compelling question)
-            - **Interest**: Clear value proposition that resonates with audience pain points
-            - **Desire**: Social proof, authority, or compelling outcome visualization
-            - **Action**: Persuasive, specific CTA that drives immediate response
-            
-            **2. Target Audience Deep Analysis:**
-            - Identify specific job titles and seniority levels within the audience
-            - Address core pain points and challenges they face daily
-            - Focus on desired outcomes and success metrics they care about
-            - Consider their decision-making process and buying triggers
-            
-            **3. Hook Strategies (Choose Most Effective):**
-            - **Problem Hook**: "Struggling with [specific pain point]?"
-            - **Stat Hook**: "[X]% of [audience] are missing out on [benefit]"
-            - **Question Hook**: "What if you could [achieve desired outcome] in [timeframe]?"
-            - **Curiosity Hook**: "The [industry] secret that [outcome]"
-            
-            **4. Value Proposition Guidelines:**
-            - Lead with the transformation/outcome, not the product features
-            - Quantify benefits where possible (time saved, revenue increased, etc.)
-            - Address the "what's in it for me" immediately
-            - Differentiate from competitors with unique positioning
-            
-            **5. Social Proof & Authority Elements:**
-            - Reference client results, case studies, or success stories
-            - Include industry recognition, certifications, or thought leadership
-            - Mention company size, growth metrics, or market position
-            - Use testimonial-style language when appropriate
-            
-            **6. CTA Optimization:**
-            - Use action-oriented language: "Book a Call", "Get Started", "Download Now"
-            - Create urgency without being pushy: "Limited spots", "Free consultation"
-            - Match CTA to funnel stage and audience readiness
-            - Keep CTAs specific and benefit-focused
-            
-            **7. LinkedIn B2B Best Practices:**
-            - Professional tone that builds trust and credibility
-            - Avoid overly promotional or salesy language
-            - Focus on business outcomes and ROI
-            - Use industry-appropriate terminology and context
-            - Ensure mobile-friendly formatting and readability
-            
-            **Output Requirements:**
-            Generate JSON with exactly these fields:
-            {{
-                "headline": "Attention-grabbing headline (max 150 chars) using hook strategy",
-                "description": "AIDA-structured description (max 600 chars) with value prop + social proof",
-                "cta": "Compelling action-oriented CTA (max 20 chars)"
-            }}
-            
-            **Quality Checklist:**
-            ✓ Hook immediately addresses audience pain point or desire
-            ✓ Value proposition is clear and benefit-focused
-            ✓ Social proof or authority signal included
-            ✓ CTA creates urgency and specifies next step
-            ✓ Professional tone appropriate for B2B LinkedIn
-            ✓ Mobile-optimized length and formatting
-            ✓ Differentiated positioning vs. competitors
-            
-            Return ONLY the JSON with no additional text or formatting.
-            """
+            copy_vars = {
+                "company_analysis": state.company_analysis
+                or "Professional B2B business",
+                "product_name": state.request.product_name,
+                "business_value": state.request.business_value,
+                "audience": state.request.audience,
+            }
             if state.request.body_text:
-                copy_prompt += f"\n\n override description field with this text: {state.request.body_text}"
+                copy_vars["description_override"] = state.request.body_text
             if state.request.footer_text:
-                copy_prompt += f"\n\n override cta field with this text: {state.request.footer_text}"
-
-            response = await self.llm.ainvoke([HumanMessage(content=copy_prompt)])
+                copy_vars["cta_override"] = state.request.footer_text
 
             try:
-                import json
-
-                ad_copy = json.loads(response.content.strip())
-                state.ad_copy = ad_copy
-            except json.JSONDecodeError:
-                # Enhanced fallback if JSON parsing fails
-                state.ad_copy = {
-                    "headline": f"Ready to Transform Your {state.request.audience} Strategy?",
-                    "description": f"See how {state.request.product_name} delivers {state.request.business_value}. Join industry leaders who've already made the switch.",
-                    "cta": "Book a Call",
-                }
+                async with asyncio.timeout(_WORKFLOW_STEP_TIMEOUT):
+                    state.ad_copy = await self._cached_ainvoke(
+                        self.copy_llm,
+                        "ad_copy_v3",
+                        copy_vars,
+                        [
+                            SystemMessage(content=_AD_COPY_SYSTEM_PROMPT),
+                            _input_message(copy_vars),
+                        ],
+                        json_object=True,
+                        parse=_parse_ad_copy,
+                        # The overrides are copied into the ad as written
+                        verbatim=("description_override", "cta_override"),
+                    )
+            except TimeoutError:
+                raise TimeoutError(
+                    f"Ad copy timed out after {_WORKFLOW_STEP_TIMEOUT}s"
+                )
 
         except Exception as e:
             logger.error(f"Error generating ad copy: {e}")
@@ -471,35 +837,36 @@ class ImageGenerationService:
 
         return state
 
-    async def _generate_images_node(self, state: WorkflowState) -> WorkflowState:
-        """Generate images using the enhanced prompts."""
-        try:
-            if not state.enhanced_prompts:
-                raise ValueError("No enhanced prompts available")
+    async def _generate_ads(self, state: WorkflowState) -> WorkflowState:
+        """Generate prompts and ad copy, starting each image as soon as its prompt is ready."""
+        # Generate request ID for this generation session
+        request_id = str(uuid.uuid4())
+        image_tasks: List[asyncio.Task] = []
 
-            # Generate request ID for this generation session
-            request_id = str(uuid.uuid4())
+        def start_image(index: int, style: ImageStyle, style_value: str, prompt: str):
+            task = asyncio.create_task(
+                self._generate_single_image(prompt, style, request_id, state)
+            )
+            image_tasks.append(task)
 
-            # Generate images sequentially to respect rate limits (5/min for DALL-E 3)
-            images: List[GeneratedImage] = []
-            for i, (prompt, style) in enumerate(
-                zip(state.enhanced_prompts, self.styles)
-            ):
-                try:
-                    # Add delay between requests to respect rate limits
-                    if i > 0:
-                        await asyncio.sleep(
-                            12
-                        )  # 12 seconds between requests (5 per minute)
+        try:
+            await self._generate_content(state, on_prompt=start_image)
+            if state.error:
+                raise ValueError(state.error)
 
-                    image = await self._generate_single_image(prompt, style, request_id)
-                    images.append(image)
-                    logger.info(f"Generated image {i+1}/5 for style: {style}")
+            # Rate limits are paced from the response headers in _generate_single_image
+            results = await asyncio.gather(*image_tasks, return_exceptions=True)
 
-                except Exception as e:
-                    logger.error(f"Error generating image for style {style}: {e}")
+            images: List[GeneratedImage] = []
+            for result in results:
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                if isinstance(result, BaseException):
+                    logger.error(f"Error generating image: {result}")
                     # Continue with other images even if one fails
                     continue
+                images.append(result)
+                logger.info(f"Generated image for style: {result.style}")
 
             state.generated_images = images
 
@@ -509,7 +876,9 @@ class ImageGenerationService:
 
         except Exception as e:
             logger.error(f"Error generating images: {e}")
-            state.error = f"Image generation failed: {str(e)}"
+            state.error = state.error or f"Image generation failed: {str(e)}"
+            for task in image_tasks:
+                task.cancel()
 
         return state
 
@@ -539,19 +908,14 @@ class ImageGenerationService:
             
             # Add reference images if available in state
             if state and state.reference_images:
-                for ref_img in state.reference_images:
-                    content.append({
-                        "type": "input_image",
-                        "image_url": f"data:image/jpeg;base64,{ref_img.base64_image}",
-                    })
-                    # Also add file_id if available
-                    if hasattr(ref_img, 'id') and ref_img.id:
-                        content.append({
-                            "type": "input_image",
-                            "file_id": ref_img.id,
-                        })
-
-            response = await self.openai_client.responses.create(
+                content.extend(
+                    _image_input(ref_img.id) for ref_img in state.reference_images
+                )
+
+            await self._wait_for_rate_limit()
+            raw_response = await _call_with_retry(
+                _IMAGE_SEMAPHORE,
+                self.openai_client.responses.with_raw_response.create,
                 model="gpt-4.1",
                 input=[
                     {
@@ -561,6 +925,8 @@ class ImageGenerationService:
                 ],
                 tools=[{"type": "image_generation"}],
             )
+            self._record_rate_limit(raw_response.headers)
+            response = raw_response.parse()
             
             image_generation_calls = [
                 output
@@ -583,10 +949,9 @@ class ImageGenerationService:
             
             if image_data:
                 image_base64 = image_data[0]
-                with open(image_path, "wb") as f:
-                    f.write(base64.b64decode(image_base64))
+                await asyncio.to_thread(_save_image, image_path, image_base64)
             else:
-                print(response.output.content)
+                logger.warning(f"No image returned for {image_name}: {response.output}")
 
             
             # Create localhost URL
@@ -615,27 +980,20 @@ class ImageGenerationService:
 
     def _get_style_description(self, style: ImageStyle) -> str:
         """Get detailed description for each image style optimized for LinkedIn ads."""
-        style_descriptions = {
-            ImageStyle.PROFESSIONAL: """Professional business person on clean, simple background. Show: confident business professional in suit or professional attire, positioned prominently in frame, warm studio lighting, diverse representation. Background: solid white, light gray, or subtle blue gradient - NO office environments, NO complex backgrounds. Technical specs: shot on Canon 5D with 50mm lens, shallow depth of field focusing on person, high contrast between person and background for text overlay. Person should have confident, approachable expression with professional credibility.""",
-            ImageStyle.MODERN: """Modern professional with tech-forward styling on minimalist backdrop. Show: contemporary business person in modern professional attire, clean lines, tech-savvy appearance. Background: solid modern colors like navy blue, teal, or clean geometric pattern - AVOID complex office environments. Technical specs: crisp quality, modern color schemes, mobile-optimized composition. Focus on single person with contemporary, innovative look against simple background.""",
-            ImageStyle.CREATIVE: """Creative professional with artistic but business-appropriate styling. Show: expressive but professional person with creative energy, approachable demeanor, engaging eye contact. Background: simple vibrant colors or subtle artistic patterns - NOT overwhelming, NO complex environments. Use compelling lighting and rich textures on the person while keeping background minimal. Balance creativity with professional credibility through clean composition.""",
-            ImageStyle.MINIMALIST: """Ultra-clean portrait with maximum simplicity. Show: single professional person, headshot or upper body, simple clothing, clear focus on person. Background: pure white, light gray, or single solid color - absolutely minimal, NO patterns or distractions. Technical specs: sharp focus on person, clean lines, professional lighting. Emphasize clarity and simplicity with lots of negative space around the person.""",
-            ImageStyle.BOLD: """Confident professional with strong visual impact on high-contrast background. Show: dynamic business person with confident presence, strong expression, professional attire. Background: bold solid colors like deep blue, black, or strong contrast colors - NO complex elements. Technical specs: high contrast between person and background, energetic lighting on person. Focus on single confident professional against simple, bold background.""",
-        }
-        return style_descriptions.get(
+        return _STYLE_DESCRIPTIONS.get(
             style, "Professional business style optimized for LinkedIn engagement"
         )
 
     async def generate_images(
         self, request: ImageGenerationRequest
     ) -> List[GeneratedImage]:
-        """Generate images using the LangGraph workflow."""
+        """Generate images using the full workflow."""
         try:
             # Create initial state
             initial_state = WorkflowState(request=request)
 
             # Run the workflow
-            result = await self.workflow.ainvoke(initial_state)
+            result = await self._run_workflow(initial_state)
 
             if result.error:
                 logger.error(f"Workflow error: {result.error}")
@@ -662,6 +1020,7 @@ class ImageGenerationService:
         self, request: ImageGenerationRequest, event_stream_callback=None
     ) -> List[GeneratedImage]:
         """Generate images with streaming progress updates including all workflow steps."""
+        events = StreamEventEmitter(event_stream_callback)
         try:
             # Generate request ID for this generation session
             request_id = str(uuid.uuid4())
@@ -669,154 +1028,166 @@ class ImageGenerationService:
             # Create initial state
             current_state = WorkflowState(request=request)
 
-            # Step 1: Company Analysis
-            if event_stream_callback:
-                await event_stream_callback(
-                    {
-                        "type": "progress",
-                        "step": "company_analysis",
-                        "message": "🔍 Analyzing company information...",
-                    }
-                )
+            # Steps 1 and 2: Company Analysis and Reference Images run together
+            await events.emit(
+                {
+                    "type": "progress",
+                    "step": "company_analysis",
+                    "message": "🔍 Analyzing company information...",
+                }
+            )
+            await events.emit(
+                {
+                    "type": "progress",
+                    "step": "loading_references",
+                    "message": "📁 Loading reference ad examples...",
+                }
+            )
 
-            current_state = await self._analyze_company(current_state)
+            async with asyncio.timeout(_WORKFLOW_STEP_TIMEOUT):
+                current_state = await self._prepare_context(current_state)
             if current_state.error:
-                raise Exception(f"Company analysis failed: {current_state.error}")
-
-            if event_stream_callback:
-                await event_stream_callback(
-                    {
-                        "type": "step_completed",
-                        "step": "company_analysis",
-                        "message": "✅ Company analysis completed",
-                    }
-                )
+                raise Exception(current_state.error)
 
-            # Step 2: Load Reference Images
-            if event_stream_callback:
-                await event_stream_callback(
-                    {
-                        "type": "progress",
-                        "step": "loading_references",
-                        "message": "📁 Loading reference ad examples...",
-                    }
-                )
+            await events.emit(
+                {
+                    "type": "step_completed",
+                    "step": "company_analysis",
+                    "message": "✅ Company analysis completed",
+                }
+            )
+            await events.emit(
+                {
+                    "type": "step_completed",
+                    "step": "loading_references",
+                    "message": f"✅ Loaded {len(current_state.reference_images)} reference images",
+                }
+            )
 
-            current_state = await self._load_reference_images(current_state)
-            if current_state.error:
-                raise Exception(f"Reference loading failed: {current_state.error}")
+            # Steps 3-5: Enhanced Prompts and Ad Copy run together, and each
+            # style's image starts as soon as its prompt has streamed in
+            await events.emit(
+                {
+                    "type": "progress",
+                    "step": "prompt_enhancement",
+                    "message": "🎯 Enhancing prompts with AI...",
+                }
+            )
+            await events.emit(
+                {
+                    "type": "progress",
+                    "step": "copy_generation",
+                    "message": "✍️ Generating compelling ad copy...",
+                }
+            )
+            await events.emit(
+                {
+                    "type": "progress",
+                    "step": "image_generation",
+                    "message": "🎨 Generating images with DALL-E 3...",
+                }
+            )
 
-            if event_stream_callback:
-                await event_stream_callback(
-                    {
-                        "type": "step_completed",
-                        "step": "loading_references",
-                        "message": f"✅ Loaded {len(current_state.reference_images)} reference images",
-                    }
-                )
+            # Generate images concurrently with progress updates
+            completed = 0
 
-            # Step 3: Generate Enhanced Prompts
-            if event_stream_callback:
-                await event_stream_callback(
-                    {
-                        "type": "progress",
-                        "step": "prompt_enhancement",
-                        "message": "🎯 Enhancing prompts with AI...",
-                    }
-                )
+            async def generate_with_progress(
+                index: int, prompt: str, style: ImageStyle, style_value: str
+            ) -> Optional[GeneratedImage]:
+                nonlocal completed
+                try:
+                    await events.emit(
+                        {
+                            "type": "progress",
+                            "step": "image_generation",
+                            "message": f"🎨 Generating {style_value} style image ({index+1}/5)...",
+                        }
+                    )
 
-            current_state = await self._enhance_prompts(current_state)
-            if current_state.error:
-                raise Exception(f"Prompt enhancement failed: {current_state.error}")
+                    image = await self._generate_single_image(
+                        prompt, style, request_id, current_state
+                    )
+                    completed += 1
 
-            if event_stream_callback:
-                await event_stream_callback(
-                    {
-                        "type": "step_completed",
-                        "step": "prompt_enhancement",
-                        "message": "✅ Enhanced prompts generated",
-                        "prompts": current_state.enhanced_prompts,
-                    }
-                )
+                    await events.emit(
+                        {
+                            "type": "image_ready",
+                            "step": "image_generation",
+                            "message": f"✅ {style_value} style image completed",
+                            "image": image.dict(),
+                            "progress": f"{completed}/5",
+                        }
+                    )
+                    return image
 
-            # Step 4: Generate Ad Copy
-            if event_stream_callback:
-                await event_stream_callback(
-                    {
-                        "type": "progress",
-                        "step": "copy_generation",
-                        "message": "✍️ Generating compelling ad copy...",
-                    }
-                )
+                except Exception as e:
+                    logger.error(f"Error generating image for style {style}: {e}")
+                    await events.emit(
+                        {
+                            "type": "error",
+                            "step": "image_generation",
+                            "message": f"❌ Failed to generate {style_value} style image: {str(e)}",
+                        }
+                    )
+                    return None
 
-            current_state = await self._generate_ad_copy(current_state)
-            if current_state.error:
-                raise Exception(f"Ad copy generation failed: {current_state.error}")
+            # A stalled call cancels its siblings instead of holding pooled connections
+            tasks: List[asyncio.Task] = []
+            try:
+                async with asyncio.timeout(_IMAGE_GENERATION_TIMEOUT):
+                    async with asyncio.TaskGroup() as tg:
+
+                        def start_image(
+                            index: int, style: ImageStyle, style_value: str, prompt: str
+                        ):
+                            tasks.append(
+                                tg.create_task(
+                                    generate_with_progress(
+                                        index, prompt, style, style_value
+                                    )
+                                )
+                            )
 
-            if event_stream_callback:
-                await event_stream_callback(
-                    {
-                        "type": "step_completed",
-                        "step": "copy_generation",
-                        "message": "✅ Ad copy generated",
-                        "ad_copy": current_state.ad_copy,
-                    }
+                        current_state = await self._generate_content(
+                            current_state, on_prompt=start_image
+                        )
+                        # On error no prompt was dispatched, so no image is running
+                        if not current_state.error:
+                            await events.emit(
+                                {
+                                    "type": "step_completed",
+                                    "step": "prompt_enhancement",
+                                    "message": "✅ Enhanced prompts generated",
+                                    "prompts": current_state.enhanced_prompts,
+                                }
+                            )
+                            await events.emit(
+                                {
+                                    "type": "step_completed",
+                                    "step": "copy_generation",
+                                    "message": "✅ Ad copy generated",
+                                    "ad_copy": current_state.ad_copy,
+                                }
+                            )
+            except TimeoutError:
+                logger.error(
+                    f"Image generation timed out after {_IMAGE_GENERATION_TIMEOUT}s"
                 )
-
-            # Step 5: Generate Images
-            if event_stream_callback:
-                await event_stream_callback(
+                await events.emit(
                     {
-                        "type": "progress",
+                        "type": "error",
                         "step": "image_generation",
-                        "message": "🎨 Generating images with DALL-E 3...",
+                        "message": "❌ Image generation timed out",
                     }
                 )
+            if current_state.error:
+                raise Exception(current_state.error)
 
-            # Generate images with progress updates
-            images: List[GeneratedImage] = []
-            for i, (prompt, style) in enumerate(
-                zip(current_state.enhanced_prompts, self.styles)
-            ):
-                try:
-                    if event_stream_callback:
-                        await event_stream_callback(
-                            {
-                                "type": "progress",
-                                "step": "image_generation",
-                                "message": f"🎨 Generating {style.value} style image ({i+1}/5)...",
-                            }
-                        )
-
-                    # Add delay between requests to respect rate limits
-                    if i > 0:
-                        await asyncio.sleep(12)  # 12 seconds between requests
-
-                    image = await self._generate_single_image(prompt, style, request_id)
-                    images.append(image)
-
-                    if event_stream_callback:
-                        await event_stream_callback(
-                            {
-                                "type": "image_ready",
-                                "step": "image_generation",
-                                "message": f"✅ {style.value} style image completed",
-                                "image": image.dict(),
-                                "progress": f"{i+1}/5",
-                            }
-                        )
-
-                except Exception as e:
-                    logger.error(f"Error generating image for style {style}: {e}")
-                    if event_stream_callback:
-                        await event_stream_callback(
-                            {
-                                "type": "error",
-                                "step": "image_generation",
-                                "message": f"❌ Failed to generate {style.value} style image: {str(e)}",
-                            }
-                        )
-                    continue
+            images: List[GeneratedImage] = [
+                task.result()
+                for task in tasks
+                if task.done() and not task.cancelled() and task.result()
+            ]
 
             # Store images with request ID
             if images:
@@ -837,39 +1208,47 @@ class ImageGenerationService:
                     f"Successfully stored images. Total storage entries: {len(self.image_storage)}"
                 )
 
-                if event_stream_callback:
-                    await event_stream_callback(
-                        {
-                            "type": "generation_complete",
-                            "message": f"🎉 All {len(images)} images generated successfully!",
-                            "images": [img.dict() for img in images],
-                            "enhanced_prompts": current_state.enhanced_prompts,
-                            "ad_copy": current_state.ad_copy,
-                            "request_id": request_id,
-                        }
-                    )
+                await events.emit(
+                    {
+                        "type": "generation_complete",
+                        "message": f"🎉 All {len(images)} images generated successfully!",
+                        # Images were already streamed one by one as image_ready
+                        "count": len(images),
+                        "enhanced_prompts": current_state.enhanced_prompts,
+                        "ad_copy": current_state.ad_copy,
+                        "request_id": request_id,
+                    }
+                )
 
             return images
 
         except Exception as e:
             logger.error(f"Error in generate_images_with_progress: {e}")
-            if event_stream_callback:
-                await event_stream_callback(
-                    {"type": "error", "message": f"❌ Generation failed: {str(e)}"}
-                )
+            await events.emit(
+                {"type": "error", "message": f"❌ Generation failed: {str(e)}"}
+            )
             return await self._fallback_generation(request)
+        finally:
+            # Flush pending events before the caller closes its stream
+            await events.aclose()
 
     async def _fallback_generation(
         self, request: ImageGenerationRequest
     ) -> List[GeneratedImage]:
-        """Fallback image generation without LangGraph."""
-        images = []
+        """Fallback image generation without the LLM workflow."""
         request_id = str(uuid.uuid4())
 
-        for style in self.styles:
-            prompt = self._create_fallback_prompt(request, style)
-            image = await self._generate_single_image(prompt, style, request_id)
-            images.append(image)
+        # _generate_single_image returns a placeholder on failure, so this never raises
+        images = list(
+            await asyncio.gather(
+                *(
+                    self._generate_single_image(
+                        self._create_fallback_prompt(request, style), style, request_id
+                    )
+                    for style, _ in self._styles_cached
+                )
+            )
+        )
 
         # Store images with request ID for later modification
         if images:
@@ -880,7 +1259,7 @@ class ImageGenerationService:
     def _create_fallback_prompt(
         self, request: ImageGenerationRequest, style: ImageStyle
     ) -> str:
-        """Create a LinkedIn-optimized prompt without LangGraph enhancement."""
+        """Create a LinkedIn-optimized prompt without LLM enhancement."""
         return f"""
         Create a high-performing LinkedIn advertisement image for {request.product_name}.
         
@@ -923,23 +1302,10 @@ class ImageGenerationService:
                 f"Modifying image from URL: {request.original_image_url} with prompt: {request.modification_prompt}"
             )
 
-            # Create modified prompt for LinkedIn ads
-            modified_prompt = f"""Create a professional LinkedIn advertisement image based on this modification request: {request.modification_prompt}
-
-Ensure the image maintains LinkedIn B2B ad best practices:
-- Professional business people (1-2 max) as main subjects
-- Simple, clean backgrounds (solid colors, subtle gradients) that contrast well with text
-- High contrast areas reserved for CTA text overlay
-- Square format (1024x1024) optimized for LinkedIn mobile feed
-- Professional photography quality (Canon 5D, 50mm lens, studio lighting)
-- Diverse, authentic representation
-- Clear visual hierarchy for mobile viewing
-- Space allocation for text overlay (20-30% of image)
-- B2B credibility and thought leadership positioning
-
-IMPORTANT: Generate image in exactly 1024x1024 pixels resolution. Ensure proper aspect ratio and high quality.
-
-Apply the requested modifications while maintaining these professional standards."""
+            # The static guidelines go first so provider-side prefix caching can
+            # reuse them; only the modification request varies per call
+            modification_text = f"Modification Request: {request.modification_prompt}"
+            modified_prompt = f"{_MODIFY_SYSTEM_PROMPT}\n\n{modification_text}"
 
             if not self.openai_client:
                 # Return placeholder when no API key
@@ -952,10 +1318,7 @@ Apply the requested modifications while maintaining these professional standards
                 )
                 
             # Build content with prompt and reference images
-            content = [{"type": "input_text", "text": modified_prompt}]
-            
-            reference_images = []
-            
+            content = [{"type": "input_text", "text": modification_text}]
 
             static_dir = Path(__file__).parent.parent / "static"
             static_dir.mkdir(exist_ok=True)
@@ -965,42 +1328,30 @@ Apply the requested modifications while maintaining these professional standards
             
             image_path = static_dir / image_name
             
-            with open(image_path, "rb") as img_file:
-                                img_data = base64.b64encode(img_file.read()).decode("utf-8")
-                                result = await self.openai_client.files.create(
-                                    file=img_file,
-                                    purpose="vision",
-                                )
-                                reference_images.append(ReferenceImage(id=result.id, base64_image=img_data))
-                                logger.info(
-                                    f"Loaded main reference: {request.original_image_url}"
-                                )
-            
-            
-            # Add reference images if available in state
-            if reference_images:
-                for ref_img in reference_images:
-                    content.append({
-                        "type": "input_image",
-                        "image_url": f"data:image/jpeg;base64,{ref_img.base64_image}",
-                    })
-                    # Also add file_id if available
-                    if hasattr(ref_img, 'id') and ref_img.id:
-                        content.append({
-                            "type": "input_image",
-                            "file_id": ref_img.id,
-                        })
-
-            response = await self.openai_client.responses.create(
+            img_bytes = await asyncio.to_thread(image_path.read_bytes)
+            result = await self.openai_client.files.create(
+                file=(image_name, img_bytes),
+                purpose="vision",
+            )
+            content.append(_image_input(result.id))
+            logger.info(f"Loaded main reference: {request.original_image_url}")
+
+            await self._wait_for_rate_limit()
+            raw_response = await _call_with_retry(
+                _IMAGE_SEMAPHORE,
+                self.openai_client.responses.with_raw_response.create,
                 model="gpt-4.1",
                 input=[
+                    {"role": "system", "content": _MODIFY_SYSTEM_PROMPT},
                     {
                         "role": "user", 
                         "content": content
-                    }
+                    },
                 ],
                 tools=[{"type": "image_generation"}],
             )
+            self._record_rate_limit(raw_response.headers)
+            response = raw_response.parse()
             
             image_generation_calls = [
                 output
@@ -1023,10 +1374,9 @@ Apply the requested modifications while maintaining these professional standards
             
             if image_data:
                 image_base64 = image_data[0]
-                with open(image_path, "wb") as f:
-                    f.write(base64.b64decode(image_base64))
+                await asyncio.to_thread(_save_image, image_path, image_base64)
             else:
-                print(response.output.content)
+                logger.warning(f"No image returned for {image_name}: {response.output}")
 
             
             # Create localhost URL
@@ -1056,19 +1406,8 @@ Apply the requested modifications while maintaining these professional standards
     ) -> str:
         """Create research-backed fallback prompts when LLM is not available."""
         base_context = f"professional {request.product_name} for {request.audience}"
-
-        fallback_prompts = {
-            ImageStyle.PROFESSIONAL: f"""Professional business person in suit, confident expression, shot on Canon 5D with studio lighting, solid white or light gray background, upper body composition, diverse representation, high contrast for text overlay, square format, LinkedIn optimized. Context: {base_context}""",
-            ImageStyle.MODERN: f"""Modern business professional in contemporary attire, tech-savvy appearance, clean navy blue or teal solid background, professional photography, confident pose, diverse representation, high contrast, square format, mobile optimized. Context: {base_context}""",
-            ImageStyle.CREATIVE: f"""Creative professional with expressive but business-appropriate styling, approachable demeanor, simple vibrant colored background, artistic lighting, engaging eye contact, diverse representation, clean composition, high contrast for text. Context: {base_context}""",
-            ImageStyle.MINIMALIST: f"""Single business professional headshot, simple clothing, pure white background, minimal composition, sharp focus on person, professional lighting, lots of negative space, diverse representation, ultra-clean design. Context: {base_context}""",
-            ImageStyle.BOLD: f"""Confident business person with strong presence, professional attire, bold solid color background (deep blue or black), high contrast lighting, dynamic expression, diverse representation, square format, impactful composition. Context: {base_context}""",
-        }
-
-        return fallback_prompts.get(
-            style,
-            f"Professional photorealistic LinkedIn advertisement image for {base_context}, shot on Canon 5D with 50mm lens, diverse representation, modern office setting, high contrast for text overlay, B2B optimized",
-        )
+        template = _FALLBACK_PROMPT_TEMPLATES.get(style, _DEFAULT_FALLBACK_PROMPT)
+        return template.format(base_context=base_context)
 
     async def generate_images_with_workflow(
         self, request: ImageGenerationRequest
@@ -1079,7 +1418,7 @@ Apply the requested modifications while maintaining these professional standards
             initial_state = WorkflowState(request=request)
 
             # Run the workflow
-            result = await self.workflow.ainvoke(initial_state)
+            result = await self._run_workflow(initial_state)
 
             if result.error:
                 logger.error(f"Workflow error: {result.error}")
@@ -0,0 +1,58 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Collection, Dict, Optional, Tuple
+
+import orjson
+
+
+class LLMCache:
+    """In-memory LRU cache for LLM responses with a time-to-live.
+
+    Entries are keyed on a prompt template identifier plus the variables used
+    to render it, so repeated requests with the same inputs skip the LLM call.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl_seconds: float = 3600):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        template_id: str, variables: Dict[str, Any], verbatim: Collection[str] = ()
+    ) -> str:
+        """Build a deterministic key from a template id and its input variables.
+
+        Variables named in ``verbatim`` are keyed as-is, for inputs the prompt
+        reproduces exactly and whose formatting therefore matters.
+        """
+        # Collapse whitespace so trivially different form input still hits
+        normalized = {
+            name: str(value) if name in verbatim else " ".join(str(value).split())
+            for name, value in variables.items()
+        }
+        payload = orjson.dumps(
+            {"template_id": template_id, "vars": normalized},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
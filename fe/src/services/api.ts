@@ -52,6 +52,7 @@ export interface StreamEvent {
   message: string;
   request_id?: string;
   images?: GeneratedImage[];
+  count?: number;
   image?: GeneratedImage;
   progress?: string;
   prompts?: string[];